@@ -1,5 +1,7 @@
-from typing import Iterable, Optional, Union
-from ics import Calendar, Event
+from datetime import timezone
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Union
+from uuid import uuid4
 from zoneinfo import ZoneInfo
 
 
@@ -19,7 +21,14 @@ LEAGUE_TZ_MAP = {
     "conference": "Europe/Zurich",
 }
 
+# RFC 5545 building blocks; we only emit UID, DTSTART, SUMMARY and DESCRIPTION
+_CAL_HEAD = "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Soccer Calendar App//EN\r\n"
+_CAL_TAIL = "END:VCALENDAR\r\n"
+_EVENT_TMPL = "BEGIN:VEVENT\r\nUID:{uid}\r\nDTSTART:{dt}\r\nSUMMARY:{name}\r\n{descr}END:VEVENT\r\n"
+_UTC_FMT = "%Y%m%dT%H%M%SZ"
 
+
+@lru_cache(maxsize=None)
 def _detect_timezone(competition_name: Optional[str]) -> ZoneInfo:
     """
     Given a competition/league label, return a ZoneInfo timezone.
@@ -34,8 +43,38 @@ def _detect_timezone(competition_name: Optional[str]) -> ZoneInfo:
     return ZoneInfo("UTC")
 
 
-def _calendar_from_df(df, competition_name: Optional[str] = None) -> Calendar:
-    c = Calendar()
+def _escape(text: str) -> str:
+    """Escape a value for an iCalendar TEXT property."""
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _escape_series(values):
+    """Vectorized _escape over a pandas Series of strings."""
+    for raw, escaped in (("\\", "\\\\"), (";", "\\;"), (",", "\\,"), ("\n", "\\n")):
+        values = values.str.replace(raw, escaped, regex=False)
+    return values
+
+
+def _utc_stamps(dates):
+    """Format a tz-aware datetime Series as UTC DTSTART values."""
+    return dates.dt.tz_convert("UTC").dt.strftime(_UTC_FMT).to_numpy()
+
+
+def _render_calendar(stamps: Iterable[str], names: Iterable[str], descrs: Iterable[str]) -> str:
+    """Render already-escaped event fields into a full VCALENDAR string."""
+    events = "".join(
+        _EVENT_TMPL.format(
+            uid=f"{uuid4()}@soccer-calendar-app",
+            dt=dt,
+            name=name,
+            descr=f"DESCRIPTION:{descr}\r\n" if descr else "",
+        )
+        for dt, name, descr in zip(stamps, names, descrs)
+    )
+    return _CAL_HEAD + events + _CAL_TAIL
+
+
+def _calendar_from_df(df, competition_name: Optional[str] = None) -> str:
     comp_col = None
     for candidate in ("competition", "league"):
         if candidate in df.columns:
@@ -50,23 +89,20 @@ def _calendar_from_df(df, competition_name: Optional[str] = None) -> Calendar:
         comp_name = competition_name or ""
     tz = _detect_timezone(comp_name)
 
-    for _, row in df.iterrows():
-        dt = row["date"]
-        # If CSV dates are in local league time and naive, attach the league tz
-        if getattr(dt, "tzinfo", None) is None:
-            dt = dt.replace(tzinfo=tz)
+    # If CSV dates are in local league time and naive, attach the league tz in one go
+    dates = df["date"]
+    if dates.dt.tz is None:
+        dates = dates.dt.tz_localize(tz, ambiguous=True, nonexistent="shift_forward")
 
-        home = str(row["home team"])
-        away = str(row["away team"])
-        descr = (str(row[comp_col]) if comp_col else competition_name) or ""
+    # Every field is formatted column-wise; the render loop only fills the template
+    stamps = _utc_stamps(dates)
+    names = _escape_series(df["home team"].astype(str) + " vs " + df["away team"].astype(str)).to_numpy()
+    if comp_col:
+        descrs = _escape_series(df[comp_col].astype(str)).to_numpy()
+    else:
+        descrs = [_escape(competition_name or "")] * len(df)
 
-        e = Event()
-        e.name = f"{home} vs {away}"
-        e.begin = dt
-        if descr:
-            e.description = descr
-        c.events.add(e)
-    return c
+    return _render_calendar(stamps, names, descrs)
 
 
 def export_to_ics(
@@ -82,29 +118,47 @@ def export_to_ics(
         is_df = False
 
     if is_df:
-        cal = _calendar_from_df(matches, competition_name)
+        text = _calendar_from_df(matches, competition_name)
     else:
         # iterable of objects with .date, .home, .away, .competition
-        cal = Calendar()
+        stamps, names, descrs = [], [], []
         for m in matches:
             comp_name = getattr(m, "competition", None) or competition_name or ""
-            tz = _detect_timezone(comp_name)
             dt = m.date
+            # objects may mix naive and aware dates, so this check stays per match
             if getattr(dt, "tzinfo", None) is None:
-                dt = dt.replace(tzinfo=tz)
+                dt = dt.replace(tzinfo=_detect_timezone(comp_name))
 
-            e = Event()
-            e.name = f"{m.home} vs {m.away}"
-            e.begin = dt
-            if getattr(m, "competition", None) or competition_name:
-                e.description = getattr(m, "competition", competition_name)
-            cal.events.add(e)
+            stamps.append(dt.astimezone(timezone.utc).strftime(_UTC_FMT))
+            names.append(_escape(f"{m.home} vs {m.away}"))
+            descrs.append(_escape(comp_name))
+        text = _render_calendar(stamps, names, descrs)
 
-    with open(filename, "w", encoding="utf-8") as f:
-        f.writelines(cal)
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
 
 
 def calendar_text_from_df(df, competition_name: Optional[str] = None) -> str:
     """Return .ics content as a string (for GUI download)."""
-    cal = _calendar_from_df(df, competition_name)
-    return str(cal)
\ No newline at end of file
+    return _calendar_from_df(df, competition_name)
+
+
+def calendar_texts_by_group(df, group_col: str) -> Dict[str, str]:
+    """
+    Return {group label: .ics content}, e.g. one calendar per competition.
+    Titles are formatted once for all rows; each group's naive dates are
+    localized to that group's own timezone.
+    """
+    names = _escape_series(df["home team"].astype(str) + " vs " + df["away team"].astype(str)).to_numpy()
+    # sort=False skips ordering the labels; observed=True ignores unused categories
+    groups = df.groupby(group_col, sort=False, observed=True).indices  # label -> row positions
+    needs_tz = df["date"].dt.tz is None
+
+    out: Dict[str, str] = {}
+    for label, idx in groups.items():
+        label = str(label)
+        dates = df["date"].iloc[idx]
+        if needs_tz:
+            dates = dates.dt.tz_localize(_detect_timezone(label), ambiguous=True, nonexistent="shift_forward")
+        out[label] = _render_calendar(_utc_stamps(dates), names[idx], [_escape(label)] * len(idx))
+    return out
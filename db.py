@@ -1,7 +1,35 @@
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 from models import Match
 from rapidfuzz import fuzz, process
 
+# Fixture CSVs store kickoff as dd/mm/YYYY HH:MM
+FIXTURE_DATE_FORMAT = "%d/%m/%Y %H:%M"
+
+
+def read_fixture_csv(path):
+    """
+    Read a fixture CSV with lower-cased headers and the 'date' column parsed
+    by read_csv itself. Unparseable dates become NaT so callers can dropna.
+    """
+    # Peek at the header so the date/team columns can be typed whatever their case
+    raw = {c.lower().strip(): c for c in pd.read_csv(path, nrows=0).columns}
+    date_col = raw.get("date")
+    df = pd.read_csv(
+        path,
+        engine="c",
+        parse_dates=[date_col] if date_col else None,
+        date_format=FIXTURE_DATE_FORMAT,
+        dtype={raw[c]: "string" for c in ("home team", "away team") if c in raw},
+    )
+    df.columns = [c.lower().strip() for c in df.columns]
+    if date_col and not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        # read_csv leaves the column as text if any value misses the format
+        df["date"] = pd.to_datetime(df["date"], errors="coerce", dayfirst=True)
+    return df
+
 
 def normalize_team_name(name, team_list, threshold=85):
     """
@@ -12,25 +40,59 @@ def normalize_team_name(name, team_list, threshold=85):
     """
     if not team_list:
         return name
+    return _normalize_cached(name, tuple(team_list), threshold)
+
+
+@lru_cache(maxsize=None)
+def _normalize_cached(name, team_list, threshold):
+    # Team names repeat across fixtures, so memoize the fuzzy lookup
     match, score, _ = process.extractOne(name, team_list, scorer=fuzz.token_sort_ratio)
     if score >= threshold:
         return match
     return name
 
 
+def normalize_team_names(names, team_list, threshold=85):
+    """
+    Batch version of normalize_team_name: returns {name: normalized name}.
+    Scores every name against team_list in one multi-threaded rapidfuzz call.
+    """
+    names = list(names)
+    if not team_list:
+        return {n: n for n in names}
+    team_list = list(team_list)
+    scores = process.cdist(
+        names, team_list, scorer=fuzz.token_sort_ratio, workers=-1, score_cutoff=threshold
+    )
+    best = np.argmax(scores, axis=1)  # first best on ties, like extractOne
+    return {
+        name: team_list[b] if scores[i, b] >= threshold else name
+        for i, (name, b) in enumerate(zip(names, best))
+    }
+
+
 def load_matches_from_csv(filename, selected_teams=None):
     df = pd.read_csv(filename)
 
     if selected_teams:
-        # Normalize home/away names so they align with user selection
-        df["home"] = df["home"].apply(lambda x: normalize_team_name(x, selected_teams))
-        df["away"] = df["away"].apply(lambda x: normalize_team_name(x, selected_teams))
+        # Normalize home/away names so they align with user selection;
+        # fuzzy-match each distinct name once, then map the columns
+        uniques = pd.unique(pd.concat([df["home"], df["away"]]))
+        mapping = normalize_team_names(uniques, selected_teams)
+        df["home"] = df["home"].map(mapping)
+        df["away"] = df["away"].map(mapping)
+        # Few distinct teams: category dtype keeps memory low and speeds up isin
+        df["home"] = df["home"].astype("category")
+        df["away"] = df["away"].astype("category")
 
         # Keep only matches involving selected teams
         df = df[(df["home"].isin(selected_teams)) | (df["away"].isin(selected_teams))]
 
-    matches = [
-        Match(row["date"], row["home"], row["away"], row["competition"])
-        for _, row in df.iterrows()
-    ]
+    matches = list(map(
+        Match,
+        df["date"].to_numpy(),
+        df["home"].to_numpy(),
+        df["away"].to_numpy(),
+        df["competition"].to_numpy(),
+    ))
     return matches
\ No newline at end of file
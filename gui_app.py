@@ -1,9 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import streamlit as st
 from rapidfuzz import process, fuzz
 
-from calendar_utils import calendar_text_from_df
+from calendar_utils import calendar_text_from_df, calendar_texts_by_group
+from db import read_fixture_csv
 
 DATA_DIR_DEFAULT = "data"
 
@@ -26,6 +30,7 @@ LEAGUE_NAME_MAP = {
     "conference-league": "Conference League",
 }
 
+@lru_cache(maxsize=None)
 def clean_league_name(filename: str) -> str:
     """
     Turn a CSV filename like 'la-liga-2025-UTC.csv' into a pretty label like 'La Liga'.
@@ -87,8 +92,7 @@ selected_league_paths = [data_path / name for name in selected_league_names]
 # ---------------- Helpers ----------------
 
 def read_and_normalize(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path)
-    df.columns = df.columns.str.lower().str.strip()  # normalize headers
+    df = read_fixture_csv(path)  # lower-cased headers, dates parsed while reading
 
     # require basic columns
     required = {"date", "home team", "away team"}
@@ -96,28 +100,39 @@ def read_and_normalize(path: Path) -> pd.DataFrame:
     if missing:
         raise ValueError(f"{path.name}: missing columns {missing}. Found: {list(df.columns)}")
 
-    # parse date (your CSVs are dd/mm/YYYY HH:MM)
-    df["date"] = pd.to_datetime(df["date"], errors="coerce", dayfirst=True)
+    # drop rows whose date could not be parsed
     df = df.dropna(subset=["date"])
 
     # set a nice competition label (pretty name from filename) if not present
     if "competition" not in df.columns and "league" not in df.columns:
         df["competition"] = clean_league_name(path.name)
 
+    # Few distinct values per column: category dtype saves memory and speeds up isin/groupby
+    for col in ("home team", "away team", "competition", "league"):
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
     return df
 
 @st.cache_data(show_spinner=False)
 def load_all_selected(paths: list[Path]) -> dict[str, pd.DataFrame]:
-    out = {}
-    for p in paths:
-        out[p.name] = read_and_normalize(p)
-    return out
+    if not paths:
+        return {}
+    # pandas' C parser releases the GIL, so leagues can be read concurrently
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as ex:
+        dfs = list(ex.map(read_and_normalize, paths))
+    return {p.name: df for p, df in zip(paths, dfs)}
 
 def build_alias_clusters(team_names: list[str], threshold: int = 86):
     """
     Greedy clustering of aliases into canonical names (for ONE league).
     Returns (canonical_names, alias_to_canon).
     """
+    return _build_alias_clusters_cached(tuple(sorted(team_names)), threshold)
+
+@st.cache_data(show_spinner=False)
+def _build_alias_clusters_cached(names_tuple: tuple[str, ...], threshold: int):
+    # cached across Streamlit reruns, so the fuzzy matching only reruns when the teams or threshold change
     protect_pairs = {
         ("Paris FC", "Paris Saint-Germain"),
         ("Paris", "Paris Saint-Germain"),
@@ -126,25 +141,28 @@ def build_alias_clusters(team_names: list[str], threshold: int = 86):
     def protected(a: str, b: str) -> bool:
         return (a, b) in protect_pairs or (b, a) in protect_pairs
 
-    canon_list: list[str] = []
+    names = list(names_tuple)
+    # Score every pair in one native call; the greedy pass below only indexes into it.
+    # score_cutoff lets rapidfuzz skip pairs whose lengths can't reach the threshold
+    # (they score 0, which the greedy pass treats like any other miss).
+    scores = process.cdist(names, names, scorer=fuzz.token_set_ratio, workers=-1, score_cutoff=threshold)
+
+    canon_idx: list[int] = []
     alias_to_canon: dict[str, str] = {}
 
-    for name in sorted(team_names):
-        if not canon_list:
-            canon_list.append(name)
+    for i, name in enumerate(names):
+        if not canon_idx:
+            canon_idx.append(i)
             alias_to_canon[name] = name
             continue
 
-        best = process.extractOne(name, canon_list, scorer=fuzz.token_set_ratio)
-        if best:
-            best_name, score, _ = best
-            if score >= threshold and not protected(name, best_name):
-                alias_to_canon[name] = best_name
-            else:
-                canon_list.append(name)
-                alias_to_canon[name] = name
+        row = scores[i, canon_idx]
+        best = int(np.argmax(row))
+        best_name = names[canon_idx[best]]
+        if row[best] >= threshold and not protected(name, best_name):
+            alias_to_canon[name] = best_name
         else:
-            canon_list.append(name)
+            canon_idx.append(i)
             alias_to_canon[name] = name
 
     canonical_names = sorted(set(alias_to_canon.values()))
@@ -154,16 +172,15 @@ def apply_canonical(df: pd.DataFrame, alias_to_canon: dict[str, str], selected_c
     """
     Map home/away to canonical names and filter rows by selected canonical teams.
     """
-    df["home team canon"] = df["home team"].map(lambda x: alias_to_canon.get(x, x))
-    df["away team canon"] = df["away team"].map(lambda x: alias_to_canon.get(x, x))
-    mask = df["home team canon"].isin(selected_canon) | df["away team canon"].isin(selected_canon)
-    filt = df[mask].copy()
-    if not filt.empty:
-        # show canonical names in the event title
-        filt["home team"] = filt["home team canon"]
-        filt["away team"] = filt["away team canon"]
-        filt.drop(columns=["home team canon", "away team canon"], inplace=True, errors="ignore")
-    return filt
+    # dict lookup via map; names missing from the alias map keep their original value
+    home = df["home team"].map(alias_to_canon).fillna(df["home team"])
+    away = df["away team"].map(alias_to_canon).fillna(df["away team"])
+    mask = home.isin(selected_canon) | away.isin(selected_canon)
+
+    # select only the columns we preview/export (one allocation, input df is left untouched)
+    cols = ["date", "home team", "away team"] + [c for c in ("competition", "league") if c in df.columns]
+    # show canonical names in the event title
+    return df.loc[mask, cols].assign(**{"home team": home[mask], "away team": away[mask]})
 
 # ---------------- Load data ----------------
 
@@ -225,7 +242,7 @@ if st.button("Preview matches"):
     filtered_frames = []
     for league_file, df in league_dfs.items():
         alias_map = per_league_alias_map.get(league_file, {})
-        filt = apply_canonical(df.copy(), alias_map, selected_canon_global)
+        filt = apply_canonical(df, alias_map, selected_canon_global)
         if not filt.empty:
             # Ensure a label column exists for nicer .ics descriptions
             if "competition" not in filt.columns and "league" not in filt.columns:
@@ -238,9 +255,11 @@ if st.button("Preview matches"):
 
     combined = pd.concat(filtered_frames, ignore_index=True)
     combined.sort_values("date", inplace=True)
+    label_col = "competition" if "competition" in combined.columns else "league"
+    # concat of differing categoricals falls back to object; re-categorize for the per-league grouping
+    combined[label_col] = combined[label_col].astype("category")
 
     st.subheader("Preview")
-    label_col = "competition" if "competition" in combined.columns else "league"
     st.dataframe(
         combined[["date", "home team", "away team", label_col]],
         use_container_width=True,
@@ -261,12 +280,19 @@ if st.button("Preview matches"):
 
     # B) Per-league .ics
     with col2:
-        per_league_files = {}
-        for comp, group in combined.groupby(label_col):
-            per_league_files[f"{comp}.ics"] = calendar_text_from_df(group, competition_name=str(comp))
+        # One pass over `combined` builds every league's calendar; reuse it while the selection is unchanged
+        cache_key = (tuple(map(str, selected_league_paths)), frozenset(selected_canon_global), threshold)
+        cached = st.session_state.get("per_league_ics")
+        if cached is not None and cached[0] == cache_key:
+            per_league_files = cached[1]
+        else:
+            per_league_files = {
+                f"{comp}.ics": text for comp, text in calendar_texts_by_group(combined, label_col).items()
+            }
+            st.session_state["per_league_ics"] = (cache_key, per_league_files)
 
         if per_league_files:
-            pick = st.selectbox("Download per-league:", list(per_league_files.keys()))
+            pick = st.selectbox("Download per-league:", sorted(per_league_files))
             st.download_button(
                 label="Download selected league",
                 data=per_league_files[pick],
@@ -1,6 +1,7 @@
 import pandas as pd
 from pathlib import Path
 from calendar_utils import export_to_ics
+from db import read_fixture_csv
 from rapidfuzz import process, fuzz
 
 
@@ -22,7 +23,7 @@ def choose_from_list(prompt, options):
 
 def get_teams_from_csv(path: Path):
     df = pd.read_csv(path)
-    df.columns = df.columns.str.lower().str.strip()
+    df.columns = [c.lower().strip() for c in df.columns]
     if "home team" in df.columns and "away team" in df.columns:
         return set(df["home team"]).union(set(df["away team"]))
     else:
@@ -38,17 +39,23 @@ def make_canonical_mapper(selected_teams, threshold=86):
     using fuzzy match; if no good match, returns the original name.
     """
     selected_teams = list(selected_teams)
+    cache: dict[str, str] = {}  # team names repeat across fixtures
 
     def _canon(name: str) -> str:
         if not selected_teams or not isinstance(name, str) or not name.strip():
             return name
+        cached = cache.get(name)
+        if cached is not None:
+            return cached
+        result = name
         # token_set_ratio handles reordering & extra tokens like "FC", "CF"
         match = process.extractOne(name, selected_teams, scorer=fuzz.token_set_ratio)
         if match:
             best_name, score, _ = match
             if score >= threshold:
-                return best_name
-        return name
+                result = best_name
+        cache[name] = result
+        return result
 
     return _canon
 
@@ -82,8 +89,7 @@ def main():
     # 4) Filter each league CSV and export an .ics per league
     total_events = 0
     for path in selected_paths:
-        df = pd.read_csv(path)
-        df.columns = df.columns.str.lower().str.strip()
+        df = read_fixture_csv(path)
 
         # Required columns check
         required_cols = {"date", "home team", "away team"}
@@ -91,8 +97,7 @@ def main():
             print(f"⏭️  Skipped {path.name}: missing one of {required_cols}. Found: {list(df.columns)}")
             continue
 
-        # Parse dates (dayfirst=True to match your CSVs)
-        df["date"] = pd.to_datetime(df["date"], errors="coerce", dayfirst=True)
+        # Dates are parsed by read_fixture_csv; drop the malformed ones
         df = df.dropna(subset=["date"])
 
         # ---- Fuzzy-normalize team names to selected teams BEFORE filtering ----